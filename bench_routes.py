@@ -0,0 +1,259 @@
+"""路由基准测试：用 Flask test client 逐个请求各个页面，记录延迟分位数和 SQL 查询数，并与基线比较。
+
+用法:
+    python seed_data.py --reset                  # 先生成合成数据 (默认 bench.db)
+    python bench_routes.py                       # 跑一遍，与 bench_baseline.json 比较，有退化时退出码为 1
+    python bench_routes.py --save-baseline       # 把本次结果保存为新基线
+    python bench_routes.py --only daily_history recipe_detail --iterations 200
+
+DashScope 和 Web Push 都指向本进程内启动的桩服务 (stub_dashscope_server / stub_push_server)，不访问外网。
+写操作 (写日记、回答、加菜谱等) 会真实写入目标库，不要对生产库运行。
+查询数与数据量基本无关，可以严格比较；延迟和机器相关，换机器后先 --save-baseline 再比较。
+"""
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import datetime
+import platform
+import threading
+import statistics
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_DB = 'sqlite:///' + os.path.join(basedir, 'bench.db')
+DEFAULT_BASELINE = os.path.join(basedir, 'bench_baseline.json')
+
+
+class QueryCounter:
+    """统计主线程执行的 SQL 条数和耗时 (后台推送线程的查询不计入)"""
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.count = 0
+        self.seconds = 0.0
+        self._started = {}
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self.thread_id:
+            self._started[id(cursor)] = time.perf_counter()
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        started = self._started.pop(id(cursor), None)
+        if started is not None:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+    def reset(self):
+        self.count, self.seconds = 0, 0.0
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def vapid_private_key():
+    """临时 VAPID 私钥 (原始 32 字节的 base64url)，只用来让推送走完整的入队/投递流程"""
+    from cryptography.hazmat.primitives.asymmetric import ec
+    value = ec.generate_private_key(ec.SECP256R1()).private_numbers().private_value
+    return base64.urlsafe_b64encode(value.to_bytes(32, 'big')).decode().rstrip('=')
+
+
+def start_stubs():
+    """启动 DashScope/推送桩服务 (随机端口)，必须在导入 app 之前设置好环境变量"""
+    import stub_dashscope_server
+    import stub_push_server
+    dashscope = stub_dashscope_server.serve(port=0)
+    push = stub_push_server.serve(port=0)
+    os.environ['DASHSCOPE_GENERATION_URL'] = f"http://127.0.0.1:{dashscope.server_address[1]}/api/v1/services/aigc/text-generation/generation"
+    os.environ['VAPID_PRIVATE_KEY'] = vapid_private_key()
+    os.environ['PUSH_WORKER'] = 'thread'
+    return dashscope, push, stub_push_server.make_subscription(f"http://127.0.0.1:{push.server_address[1]}/push")
+
+
+def build_scenarios(fixtures):
+    """(名称, 方法, URL 或 按迭代次数生成 URL 的函数, 请求参数)；名称与基线文件中的键一一对应"""
+    f = fixtures
+    today = datetime.date.today()
+    rotate = lambda ids, fmt: (lambda n: fmt.format(ids[n % len(ids)]))
+    return [
+        ('index', 'GET', '/', {}),
+        ('recipes_list', 'GET', '/recipes', {}),
+        ('recipes_group', 'GET', f"/recipes/group?by=category&key={f['category']}", {}),
+        ('recipes_group_page2', 'GET', f"/recipes/group?by=category&key={f['category']}&before={f['group_before']}", {}),
+        ('recipe_detail', 'GET', rotate(f['recipe_ids'], '/recipe/{}'), {}),
+        ('what_can_i_make', 'POST', '/what_can_i_make', {'data': {'pantry': '鸡蛋 番茄 土豆 洋葱 青椒 猪肉 豆腐 米饭'}}),
+        ('search', 'GET', '/search?q=番茄', {}),
+        ('search_json', 'GET', '/search?q=红烧&format=json', {}),
+        ('journal', 'GET', '/journal', {}),
+        ('journal_month_api', 'GET', f"/api/journal/{today.year}/{today.month}", {}),
+        ('journal_add', 'POST', '/journal/add', {'json': {'date': today.strftime('%Y-%m-%d'), 'content': '基准测试日记'}}),
+        ('memories', 'GET', '/memories', {}),
+        ('memory_detail', 'GET', rotate(f['memory_ids'], '/memory/{}'), {}),
+        ('wishlist', 'GET', '/wishlist', {}),
+        ('partner', 'GET', '/partner', {}),
+        ('daily_question', 'GET', '/daily_question', {}),
+        ('daily_answer', 'POST', f"/daily_question/answer/{f['question_id']}", {'data': {'content': '基准测试回答'}}),
+        ('daily_like', 'POST', f"/daily_question/{f['question_id']}/like", {}),
+        ('daily_history', 'GET', '/daily_question/history', {}),
+        ('daily_history_page5', 'GET', f"/daily_question/history?before={f['history_before']}", {}),
+        ('ai_menu', 'GET', '/ai_menu', {}),
+        ('ai_menu_post_local', 'POST', '/ai_menu', {'data': {'people_count': '3-4人', 'preferences': '喜欢吃辣，不要香菜'}}),
+        ('ai_menu_post_hit', 'POST', '/ai_menu', {'data': {'people_count': '2', 'preferences': '清淡', 'mode': 'ai'}}),
+        ('ai_menu_post_miss', 'POST', '/ai_menu', {'data': {'people_count': '2', 'preferences': '清淡', 'mode': 'ai', 'refresh': '1'}}),
+        ('ai_menu_stream_miss', 'GET', '/ai_menu/stream?people_count=3&refresh=1', {}),
+        ('ai_menu_stats', 'GET', '/ai_menu/stats', {}),
+        ('push_stats', 'GET', '/push/stats', {}),
+        ('add_recipe', 'POST', '/add_recipe', {'data': lambda n: {
+            'recipe_name': f"基准测试菜 {time.time_ns()}-{n}", 'instructions': '1. 切\n2. 炒', 'category': '素菜',
+            'ingredient_name[]': ['鸡蛋', '番茄'], 'ingredient_qty[]': ['2个', '1个']}}),
+        ('service_worker', 'GET', '/sw.js', {}),
+    ]
+
+
+def load_fixtures(db, models, user):
+    """从已生成的数据里挑出各路由需要的 ID"""
+    Recipe, Memory, DailyQuestion, DailyAnswer = models
+    from sqlalchemy import func
+    category, _ = db.session.query(Recipe.category, func.count(Recipe.id)).group_by(Recipe.category).order_by(func.count(Recipe.id).desc()).first()
+    group_ids = [rid for (rid,) in db.session.query(Recipe.id).filter(Recipe.category == category).order_by(Recipe.id.desc()).limit(51)]
+    history = db.session.query(DailyQuestion.date_str).join(DailyAnswer, DailyAnswer.question_id == DailyQuestion.id) \
+        .filter(DailyAnswer.user_id == user.id).order_by(DailyQuestion.date_str.desc()).limit(100).all()
+    today_question = db.session.query(DailyQuestion.id).filter_by(date_str=datetime.datetime.now().strftime('%Y-%m-%d')).scalar()
+    if today_question is None or not group_ids or not history:
+        raise SystemExit("数据不完整，请先执行 python seed_data.py --reset")
+    return {
+        'category': category,
+        'group_before': group_ids[-1],
+        'recipe_ids': [rid for (rid,) in db.session.query(Recipe.id).order_by(func.random()).limit(50)],
+        'memory_ids': [mid for (mid,) in db.session.query(Memory.id).filter(Memory.author_id.in_([user.id, user.partner_id])).limit(50)],
+        'question_id': today_question,
+        'history_before': history[-1][0],
+    }
+
+
+def run_scenario(client, counter, method, url, options, iterations, warmup):
+    latencies, queries, sql_ms = [], [], []
+    for n in range(warmup + iterations):
+        target = url(n) if callable(url) else url
+        kwargs = {k: (v(n) if callable(v) else v) for k, v in options.items()}
+        counter.reset()
+        started = time.perf_counter()
+        response = client.open(target, method=method, **kwargs)
+        response.get_data()  # 流式响应在这里才真正执行完
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {target} 返回 {response.status_code}")
+        if n >= warmup:
+            latencies.append(elapsed * 1000)
+            queries.append(counter.count)
+            sql_ms.append(counter.seconds * 1000)
+    return {
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'max_ms': round(max(latencies), 2),
+        'queries': int(statistics.median(queries)),
+        'max_queries': max(queries),
+        'sql_ms': round(statistics.median(sql_ms), 2),
+    }
+
+
+def compare(results, baseline, tolerance, min_ms):
+    """返回退化列表：查询数变多，或 p95 超过基线 (1 + tolerance) 倍且绝对差值超过 min_ms"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None: continue
+        if current['queries'] > base['queries']:
+            regressions.append(f"{name}: 查询数 {base['queries']} -> {current['queries']}")
+        if current['p95_ms'] > base['p95_ms'] * (1 + tolerance) and current['p95_ms'] - base['p95_ms'] > min_ms:
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='路由基准测试')
+    parser.add_argument('--db', default=DEFAULT_DB, help='数据库 (默认 bench.db，先用 seed_data.py 生成)')
+    parser.add_argument('--user', default='user1', help='登录的账号 (需已绑定伴侣)')
+    parser.add_argument('--password', default='bench')
+    parser.add_argument('--iterations', type=int, default=30, help='每个路由计时的请求次数')
+    parser.add_argument('--warmup', type=int, default=3, help='每个路由不计时的预热次数')
+    parser.add_argument('--only', nargs='*', help='只跑这些路由 (名称见输出第一列)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线文件')
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果写入基线文件')
+    parser.add_argument('--output', help='另外把本次结果写到这个 JSON 文件')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='p95 允许比基线慢的比例')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='p95 差值小于此值时不算退化 (过滤噪声)')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.db
+    os.environ.pop('DAILY_QUESTION_SCHEDULER', None)
+    _, push_server, subscription = start_stubs()
+    sys.path.insert(0, basedir)
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from app import app, db, User, Recipe, Memory, DailyQuestion, DailyAnswer, push_worker
+
+    counter = QueryCounter()
+    event.listen(Engine, 'before_cursor_execute', counter.before)
+    event.listen(Engine, 'after_cursor_execute', counter.after)
+
+    with app.app_context():
+        user = User.query.filter_by(username=args.user).first()
+        if user is None or not user.partner_id:
+            raise SystemExit(f"找不到已绑定伴侣的账号 {args.user}，请先执行 python seed_data.py --reset")
+        # 双方都订阅到推送桩服务，写日记/回答时会真实入队并投递
+        User.query.filter(User.id.in_([user.id, user.partner_id])).update({'push_subscription': json.dumps(subscription)}, synchronize_session=False)
+        db.session.commit()
+        fixtures = load_fixtures(db, (Recipe, Memory, DailyQuestion, DailyAnswer), user)
+        dialect = db.engine.dialect.name
+        data_size = {name: db.session.query(model).count() for name, model in (('recipes', Recipe), ('daily_questions', DailyQuestion), ('daily_answers', DailyAnswer))}
+
+    client = app.test_client()
+    if client.post('/login', data={'username': args.user, 'password': args.password}).status_code != 302:
+        raise SystemExit(f"登录失败: {args.user}")
+
+    scenarios = [s for s in build_scenarios(fixtures) if not args.only or s[0] in args.only]
+    results = {}
+    print(f"{'路由':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'SQL数':>7}{'SQL ms':>9}")
+    for name, method, url, options in scenarios:
+        results[name] = stats = run_scenario(client, counter, method, url, options, args.iterations, args.warmup)
+        print(f"{name:<24}{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}{stats['max_ms']:>9}{stats['queries']:>7}{stats['sql_ms']:>9}")
+
+    # 等后台 worker 把本轮入队的推送投递完，确认推送链路本身没有出错
+    with app.app_context():
+        while push_worker.drain_once(): pass
+    handler = push_server.RequestHandlerClass
+    print(f"\n推送桩服务收到 {handler.received} 条，失败 {handler.failed} 条")
+
+    report = {
+        'meta': {'database': dialect, 'data': data_size, 'iterations': args.iterations,
+                 'python': platform.python_version(), 'machine': platform.machine(), 'date': datetime.date.today().isoformat()},
+        'routes': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fp: json.dump(report, fp, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as fp: json.dump(report, fp, ensure_ascii=False, indent=2)
+        print(f"已保存基线: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("没有基线文件，加 --save-baseline 保存本次结果")
+        return
+    with open(args.baseline, encoding='utf-8') as fp:
+        baseline = json.load(fp)
+    base_size = baseline['meta'].get('data', {})
+    if any(abs(data_size[k] - base_size.get(k, 0)) > 0.1 * max(data_size[k], 1) for k in data_size):
+        print(f"注意: 基线的数据量 {baseline['meta'].get('data')} 与本次 {data_size} 不同，延迟对比仅供参考")
+    regressions = compare(results, baseline['routes'], args.tolerance, args.min_ms)
+    if regressions:
+        print("\n相对基线的退化:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\n与基线相比没有退化")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""DashScope 文本生成客户端：共享连接池 (keep-alive)、单次调用总时限、429/5xx 抖动重试和熔断器。
+
+不依赖 Flask，app.py 中只创建一个实例供出题和 AI 菜单共用：
+
+    client = DashScopeClient(url, model='deepseek-v4-flash')
+    text = client.generate(api_key, prompt, deadline=10, temperature=0.8)
+    for piece in client.stream(api_key, prompt, deadline=30): ...
+
+两者都可以传 on_usage=callback，成功时以接口返回的 usage ({'input_tokens': .., 'output_tokens': ..}，没有则为 {}) 回调一次。
+
+熔断器打开期间调用会立即抛出 AIUnavailable，调用方据此直接走兜底逻辑 (本地题库等)，不再等超时。
+本地测试可以用 stub_dashscope_server.py 模拟慢响应、429 和 5xx。
+"""
+import json
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class AIClientError(Exception):
+    """调用失败 (重试后仍失败、非重试类错误、返回格式不对)"""
+
+
+class AIUnavailable(AIClientError):
+    """熔断器打开，请求没有发出"""
+
+
+class CircuitBreaker:
+    """连续失败 failure_threshold 次后打开，reset_timeout 秒后半开放行一个试探请求，成功则关闭"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.opened_count = 0
+
+    @property
+    def state(self):
+        with self._lock: return self._state()
+
+    def _state(self):
+        if self._opened_at is None: return 'closed'
+        return 'half_open' if time.monotonic() - self._opened_at >= self.reset_timeout else 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == 'closed': return True
+            if state == 'half_open' and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or (self._opened_at is None and self._failures >= self.failure_threshold):
+                if self._opened_at is None: self.opened_count += 1
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {'state': self._state(), 'consecutive_failures': self._failures, 'opened': self.opened_count}
+
+
+class DashScopeClient:
+    def __init__(self, url, model, timeout=15, connect_timeout=3, max_retries=2, backoff_base=0.5, backoff_max=4,
+                 pool_size=10, breaker=None):
+        self.url = url
+        self.model = model
+        self.timeout = timeout                  # 单次调用默认总时限 (秒)，含重试和退避
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        # 重试由本类控制 (需要配合熔断和时限)，urllib3 自带的重试关掉
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._stats_lock = threading.Lock()
+        self.calls = self.retries = self.rejected = 0
+
+    def _payload(self, prompt, parameters):
+        return {
+            "model": self.model,
+            "input": {"messages": [{"role": "user", "content": prompt}]},
+            "parameters": dict({"result_format": "message"}, **parameters),
+        }
+
+    def _backoff(self, attempt, retry_after):
+        """全抖动指数退避；429 带 Retry-After 时至少等这么久"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        try: return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError: return delay
+
+    def _count(self, field):
+        with self._stats_lock: setattr(self, field, getattr(self, field) + 1)
+
+    def _post(self, api_key, payload, deadline, stream):
+        """发送请求并处理重试/熔断，返回状态码为 200 的响应"""
+        give_up_at = time.monotonic() + (deadline or self.timeout)
+        if not self.breaker.allow():
+            self._count('rejected')
+            raise AIUnavailable('AI 服务暂时不可用 (熔断中)')
+        self._count('calls')
+        headers = {'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'}
+        if stream: headers['X-DashScope-SSE'] = 'enable'
+        body = json.dumps(payload)
+        attempt = 0
+        while True:
+            remaining = max(give_up_at - time.monotonic(), 0.1)
+            retry_after = None
+            try:
+                response = self.session.post(self.url, headers=headers, data=body, stream=stream,
+                                             timeout=(min(self.connect_timeout, remaining), remaining))
+            except requests.RequestException as e:
+                error = f'请求 AI 异常: {e}'
+            else:
+                if response.status_code == 200:
+                    return response
+                error = f'AI 接口返回错误 ({response.status_code}): {response.text[:300]}'
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+                if response.status_code not in RETRYABLE_STATUS:
+                    # 400/401 等是请求本身的问题，重试没用，也不代表服务不可用
+                    self.breaker.record_success()
+                    raise AIClientError(error)
+            self.breaker.record_failure()
+            delay = self._backoff(attempt, retry_after)
+            # 重试次数用完、剩余时限不够再等一轮，或者本次失败已经让熔断器打开，都不再重试
+            if attempt >= self.max_retries or time.monotonic() + delay >= give_up_at or self.breaker.state != 'closed':
+                raise AIClientError(error)
+            attempt += 1
+            self._count('retries')
+            time.sleep(delay)
+
+    def generate(self, api_key, prompt, deadline=None, on_usage=None, **parameters):
+        """一次性返回完整文本"""
+        response = self._post(api_key, self._payload(prompt, parameters), deadline, stream=False)
+        try:
+            data = response.json()
+            content = data['output']['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError, TypeError):
+            self.breaker.record_failure()
+            raise AIClientError('AI 接口没有返回内容')
+        self.breaker.record_success()
+        if on_usage: on_usage(data.get('usage') or {})
+        return content
+
+    def stream(self, api_key, prompt, deadline=None, on_usage=None, **parameters):
+        """增量输出 (SSE)，逐段 yield 新生成的文本。只在拿到响应前重试，开始输出后中断直接抛错"""
+        payload = self._payload(prompt, dict(parameters, incremental_output=True))
+        response = self._post(api_key, payload, deadline, stream=True)
+        usage = {}
+        with response:
+            try:
+                # 按字节切行再解码，避免 decode_unicode 在多字节字符中间断开
+                for line in response.iter_lines():
+                    if not line.startswith(b'data:'): continue
+                    chunk = json.loads(line[5:].decode('utf-8'))
+                    if 'output' not in chunk:
+                        raise AIClientError(f"AI 接口返回错误: {chunk.get('message', chunk)}")
+                    # 每段都带截至当前的累计用量，以最后一段为准
+                    usage = chunk.get('usage') or usage
+                    choice = chunk['output']['choices'][0]
+                    if choice['message'].get('content'): yield choice['message']['content']
+                    if choice.get('finish_reason') not in (None, 'null'): break
+            except AIClientError:
+                # 流里返回的错误段 (限流、内容审核等) 同样算失败；不记录的话半开状态的试探名额会一直占着
+                self.breaker.record_failure()
+                raise
+            except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+                # 断流、JSON 坏掉或者段的结构不对
+                self.breaker.record_failure()
+                raise AIClientError(f'AI 输出中断: {e!r}')
+            except GeneratorExit:
+                # 调用方中途放弃 (浏览器断开)；服务本身是正常的，否则半开状态的试探名额会一直占着
+                self.breaker.record_success()
+                raise
+        self.breaker.record_success()
+        if on_usage: on_usage(usage)
+
+    def stats(self):
+        with self._stats_lock:
+            counts = {'calls': self.calls, 'retries': self.retries, 'rejected': self.rejected}
+        return dict(counts, breaker=self.breaker.stats())
@@ -1,13 +1,20 @@
 import os
 import glob
 import re
-import subprocess
+import time
 import shutil
-from app import app, db, User, Recipe, Ingredient
+import hashlib
+import tarfile
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import insert, update, delete
+from app import app, db, User, Recipe, Ingredient, ingredient_index, similarity_index, reindex_search, render_markdown, markdown_hash, SYSTEM_USERNAME
 
 REPO_URL = "https://github.com/Anduin2017/HowToCook.git"
 TEMP_DIR = "temp_howtocook"
-SYSTEM_USERNAME = "GitHub how to cook"
+BATCH_SIZE = 500  # 每个事务写入的菜谱数
 
 def setup_user():
     with app.app_context():
@@ -28,6 +35,24 @@ def clone_repo():
     print(f"正在克隆 HowToCook 仓库到 {TEMP_DIR} (这可能需要一些时间)...")
     subprocess.run(["git", "clone", "--depth", "1", REPO_URL, TEMP_DIR], check=True)
 
+def extract_tarball(path):
+    """解压 HowToCook 源码包 (例如 GitHub 下载的 .tar.gz)，返回解压目录"""
+    target = tempfile.mkdtemp(prefix="howtocook_")
+    print(f"解压 {path} 到 {target} ...")
+    with tarfile.open(path) as tar:
+        if hasattr(tarfile, 'data_filter'):
+            tar.extractall(target, filter='data')
+        else:
+            tar.extractall(target)
+    return target
+
+def find_dishes_dir(root):
+    """源码包通常多一层 HowToCook-master/ 目录，向下找 dishes/"""
+    for depth_glob in ('dishes', '*/dishes'):
+        matches = glob.glob(os.path.join(root, depth_glob))
+        if matches: return matches[0]
+    raise SystemExit(f"在 {root} 中找不到 dishes 目录")
+
 def parse_markdown(filepath):
     """简单解析 Markdown 提取菜名和材料"""
     filename = os.path.basename(filepath)
@@ -77,61 +102,136 @@ def parse_markdown(filepath):
         "instructions": "\n".join(instructions_lines)
     }
 
-def import_recipes(user_id):
-    search_path = os.path.join(TEMP_DIR, 'dishes', '**', '*.md')
-    md_files = glob.glob(search_path, recursive=True)
+def parse_source(job):
+    """进程池任务：解析一个文件并预先渲染做法 HTML"""
+    filepath, source_path, content_hash, category = job
+    parsed = parse_markdown(filepath)
+    instructions = parsed['instructions'][:2000]
+    parsed.update({
+        'instructions': instructions,
+        'instructions_html': render_markdown(instructions),
+        'instructions_hash': markdown_hash(instructions),
+        'source_path': source_path,
+        'source_hash': content_hash,
+        'category': category,
+    })
+    return parsed
 
-    print(f"找到 {len(md_files)} 个菜谱文件。准备导入...")
+def collect_sources(dishes_dir):
+    """列出所有菜谱文件及其内容哈希 (source_path 为相对 dishes 上级目录的路径)"""
+    base = os.path.dirname(os.path.abspath(dishes_dir))
+    sources = []
+    for filepath in glob.glob(os.path.join(dishes_dir, '**', '*.md'), recursive=True):
+        if 'README' in filepath or 'example' in filepath.lower() or 'template' in filepath.lower():
+            continue
+        with open(filepath, 'rb') as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        source_path = os.path.relpath(filepath, base).replace(os.sep, '/')
+        category = os.path.basename(os.path.dirname(filepath))
+        sources.append((filepath, source_path, content_hash, category))
+    return sources
 
-    success_count = 0
-    with app.app_context():
-        for filepath in md_files:
-            if 'README' in filepath or 'example' in filepath.lower() or 'template' in filepath.lower():
-                continue
+def recipe_fields(parsed):
+    return {
+        'name': parsed['name'], 'instructions': parsed['instructions'], 'category': parsed['category'],
+        'instructions_html': parsed['instructions_html'], 'instructions_hash': parsed['instructions_hash'],
+        'source_path': parsed['source_path'], 'source_hash': parsed['source_hash'],
+    }
 
-            category = os.path.basename(os.path.dirname(filepath))
-            parsed = parse_markdown(filepath)
-            name = parsed['name']
+def import_recipes(user_id, root=TEMP_DIR, workers=None, force=False):
+    started = time.perf_counter()
+    sources = collect_sources(find_dishes_dir(root))
+    print(f"找到 {len(sources)} 个菜谱文件。")
 
-            existing = Recipe.query.filter_by(name=name, user_id=user_id).first()
-            if existing:
-                existing.category = category
-                db.session.commit()
+    with app.app_context():
+        existing = {row.name: row for row in db.session.query(Recipe.id, Recipe.name, Recipe.user_id, Recipe.source_path, Recipe.source_hash)}
+
+        # 1. 只解析内容有变化的文件
+        jobs = []
+        seen_names = set()
+        for filepath, source_path, content_hash, category in sources:
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            if name in seen_names: continue  # 不同分类下的同名文件只取第一个
+            seen_names.add(name)
+            row = existing.get(name)
+            if row is not None and row.user_id != user_id:
+                print(f"跳过: {name} (与其他用户的菜谱重名)")
                 continue
+            if not force and row is not None and row.source_path == source_path and row.source_hash == content_hash:
+                continue
+            jobs.append((filepath, source_path, content_hash, category))
+        print(f"{len(sources) - len(jobs)} 个文件未变化，{len(jobs)} 个需要导入/更新。")
+        if not jobs:
+            print(f"无需导入，耗时 {time.perf_counter() - started:.2f}s")
+            return 0
 
-            print(f"导入: {name}")
-            new_recipe = Recipe(
-                name=name,
-                instructions=parsed['instructions'][:2000],
-                user_id=user_id,
-                image_file='default.jpg',
-                category=category
-            )
-            db.session.add(new_recipe)
-            db.session.flush()
+        if workers == 1 or len(jobs) < 50:
+            parsed_list = [parse_source(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed_list = list(pool.map(parse_source, jobs, chunksize=32))
+        print(f"解析完成，耗时 {time.perf_counter() - started:.2f}s")
 
-            for ing in parsed['ingredients']:
-                db.session.add(Ingredient(name=ing['name'], quantity=ing['qty'], recipe_id=new_recipe.id))
+        # 2. 批量写入，每批一个事务
+        new_count = updated_count = 0
+        for start in range(0, len(parsed_list), BATCH_SIZE):
+            batch = parsed_list[start:start + BATCH_SIZE]
+            to_insert = [p for p in batch if p['name'] not in existing]
+            to_update = [p for p in batch if p['name'] in existing]
 
-            success_count += 1
-            if success_count % 50 == 0:
-                db.session.commit()
+            recipe_ids = {}
+            if to_insert:
+                ids = db.session.scalars(
+                    insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True),
+                    [dict(recipe_fields(p), user_id=user_id, image_file='default.jpg') for p in to_insert]).all()
+                recipe_ids.update({p['name']: rid for p, rid in zip(to_insert, ids)})
+            if to_update:
+                db.session.execute(update(Recipe), [dict(recipe_fields(p), id=existing[p['name']].id) for p in to_update])
+                update_ids = [existing[p['name']].id for p in to_update]
+                db.session.execute(delete(Ingredient).where(Ingredient.recipe_id.in_(update_ids)))
+                recipe_ids.update({p['name']: existing[p['name']].id for p in to_update})
 
-        db.session.commit()
+            # quantity 列是 VARCHAR(50)，SQLite 不检查长度，PostgreSQL 会直接报错
+            ingredient_rows = [{'name': ing['name'], 'quantity': ing['qty'][:50], 'recipe_id': recipe_ids[p['name']]}
+                               for p in batch for ing in p['ingredients']]
+            if ingredient_rows:
+                db.session.execute(insert(Ingredient), ingredient_rows)
+            # 批量写入不经过 ORM flush 钩子，手动同步搜索索引
+            reindex_search(db.session.connection(), 'recipe', list(recipe_ids.values()))
+            db.session.commit()
+            new_count += len(to_insert); updated_count += len(to_update)
 
-    print(f"成功导入 {success_count} 个新菜谱！")
+        # 通知同进程内的倒排索引重建 (其他进程会通过数据签名自动发现变化)
+        ingredient_index.invalidate()
+        similarity_index.invalidate()
+
+    print(f"成功导入 {new_count} 个新菜谱，更新 {updated_count} 个，耗时 {time.perf_counter() - started:.2f}s")
+    return new_count + updated_count
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='导入 HowToCook 菜谱')
+    parser.add_argument('--source', help='本地 HowToCook 目录或源码包 (.tar.gz)；不指定则 git clone')
+    parser.add_argument('--workers', type=int, default=None, help='解析进程数 (默认 CPU 核数)')
+    parser.add_argument('--force', action='store_true', help='忽略内容哈希，全部重新导入')
+    args = parser.parse_args()
+
     user_id = setup_user()
-    clone_repo()
-    import_recipes(user_id)
+    cleanup_dir = None
+    if args.source and os.path.isfile(args.source):
+        root = cleanup_dir = extract_tarball(args.source)
+    elif args.source:
+        root = args.source
+    else:
+        clone_repo()
+        root = cleanup_dir = TEMP_DIR
+    import_recipes(user_id, root=root, workers=args.workers, force=args.force)
     
     # 清理
-    if os.path.exists(TEMP_DIR):
+    if cleanup_dir and os.path.exists(cleanup_dir):
         print("清理临时文件...")
         # Windows由于文件占用有时不好直接删带有 .git 的目录，可以用 cmd 的 rmdir
         try:
-             shutil.rmtree(TEMP_DIR, ignore_errors=True)
+             shutil.rmtree(cleanup_dir, ignore_errors=True)
         except Exception as e:
              print(f"清理临时目录失败: {e}")
             
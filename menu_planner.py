@@ -0,0 +1,217 @@
+"""离线菜单规划：按人数搭配荤素汤，按口味偏好从本地菜谱里挑菜，再合并出一份采购清单。
+
+不依赖 Flask 和数据库，数据由 app.py 查好传进来：
+
+    plan = plan_menu(candidates, '3-4人', '喜欢吃辣，不要香菜', seed='...', lookup=recipe_ids_with_ingredient)
+    text = render_plan(plan, ingredients, seasonings)   # Markdown，格式与 AI 菜单一致
+    plan.shortlist                                      # 传了 shortlist=40 时：按同样打分挑出的 40 道候选，交给 AI
+
+candidates 为 [Candidate(id, name, category)] 或同样顺序的三元组 (查询结果的行可直接传入)；lookup(关键字元组) 返回食材/调料名包含其中任一关键字的菜谱 ID 集合。
+同样的输入 (含 seed) 总是得到同样的菜单，「换一批」只是换一个 seed。
+"""
+import heapq
+import random
+import re
+from collections import namedtuple, OrderedDict
+from functools import lru_cache
+
+Candidate = namedtuple('Candidate', ['id', 'name', 'category'])
+Dish = namedtuple('Dish', ['role', 'id', 'name'])
+MenuPlan = namedtuple('MenuPlan', ['people', 'dishes', 'likes', 'avoids', 'unmatched', 'shortlist'])
+
+# 菜品种类：按 category 里的关键字归类，手动录入的中文分类和 HowToCook 的目录名 (meat_dish 等) 都认；按顺序匹配
+ROLE_KEYWORDS = OrderedDict([
+    ('汤', ('汤', '粥', 'soup')),
+    ('水产', ('水产', '海鲜', 'aquatic')),
+    ('荤菜', ('荤', '肉', 'meat')),
+    ('素菜', ('素', '蔬', 'vegetable')),
+    ('主食', ('主食', 'staple')),
+])
+# 第 n 道菜的种类；人数 + 1 道菜，最少 2 道，最多 8 道
+SLOT_ORDER = ['荤菜', '素菜', '汤', '水产', '素菜', '荤菜', '主食', '素菜']
+MAX_DISHES = len(SLOT_ORDER)
+# 某类菜挑完了 (或被忌口排除光了) 时的替补
+ROLE_FALLBACK = {'荤菜': '水产', '水产': '荤菜', '素菜': '荤菜', '汤': '素菜', '主食': None}
+
+AVOID_PREFIXES = ('不要', '不吃', '不加', '不放', '别放', '忌口', '避免', '去掉', '忌', '免', '无')
+LIKE_PREFIXES = ('喜欢吃', '喜欢', '想吃', '爱吃', '多来点', '多点', '来点', '加点', '多', '要')
+# 偏好关键字的近义词；命中菜名、分类或食材/调料任一即算匹配
+KEYWORD_ALIASES = {
+    '海鲜': ('海鲜', '水产', '虾', '鱼', '蟹', '贝', '鱿', '蛤'),
+    # 只认明确的辣味食材；单个「椒」会把青椒、胡椒粉这类不辣的菜也算进来
+    '辣': ('辣', '辣椒', '干辣椒', '花椒', '剁椒', '麻婆'),
+    '肉': ('肉', '排骨', '鸡', '鸭', '牛', '羊', '猪'),
+    '素': ('素', '蔬', '菜心', '豆腐'),
+}
+# 偏好直接对应某类菜时，多安排一道
+KEYWORD_ROLES = {'海鲜': '水产', '鱼': '水产', '虾': '水产', '汤': '汤', '粥': '汤', '肉': '荤菜', '素': '素菜', '蔬菜': '素菜'}
+CN_NUMBERS = {'一': 1, '两': 2, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10}
+TOKEN_SPLIT_RE = re.compile(r'[\s,，、;；。.!！/]+')
+QUANTITY_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([^\d\s.]*)\s*$')
+
+
+def parse_people(text, default=2):
+    """"2人" -> 2，"3-4人" -> 4，"5人以上" -> 5，"两个人" -> 2；解析不出来返回 default"""
+    numbers = [int(n) for n in re.findall(r'\d+', text or '')] or [CN_NUMBERS[ch] for ch in (text or '') if ch in CN_NUMBERS]
+    return max(1, min(max(numbers), 20)) if numbers else default
+
+
+def parse_preferences(text):
+    """返回 (想吃的关键字, 忌口关键字)；"少油少盐" 这种无法按菜谱匹配的也放进想吃，匹配不到时会在菜单里注明"""
+    likes, avoids = [], []
+    for token in TOKEN_SPLIT_RE.split((text or '').strip().lower()):
+        if not token: continue
+        avoid = next((token[len(p):] for p in AVOID_PREFIXES if token.startswith(p) and len(token) > len(p)), None)
+        if avoid:
+            avoids.append(avoid)
+            continue
+        like = next((token[len(p):] for p in LIKE_PREFIXES if token.startswith(p) and len(token) > len(p)), token)
+        likes.append(like.rstrip('的'))
+    return likes, avoids
+
+
+@lru_cache(maxsize=1024)
+def role_of(category):
+    category = (category or '').lower()
+    return next((role for role, words in ROLE_KEYWORDS.items() if any(w in category for w in words)), None)
+
+
+def _matches(keyword, lookup):
+    """关键字 (含近义词) 命中的 (匹配名字/分类的正则, 食材/调料命中的菜谱 ID)"""
+    words = KEYWORD_ALIASES.get(keyword, (keyword,))
+    return re.compile('|'.join(map(re.escape, words))), (lookup(words) if lookup else set())
+
+
+def _slots(people, likes):
+    slots = SLOT_ORDER[:max(2, min(people + 1, MAX_DISHES))]
+    # "多点海鲜" 之类：在第一道荤菜后面插一道对应种类的菜，总数不变
+    for keyword in likes:
+        role = KEYWORD_ROLES.get(keyword)
+        if role and role not in slots[:2] and len(slots) > 1:
+            slots = slots[:1] + [role] + slots[1:-1]
+    return slots
+
+
+def _rank_by_role(candidates, likes, avoids, seed, lookup, per_role):
+    """按种类分组排序，每类只留前 per_role 道：得分 = 命中想吃的关键字数，忌口的整道排除，同分按 seed 打乱。
+    返回 ({种类: [(负得分, 随机数, id, 名字)]}, 命中过的关键字)"""
+    avoid_matchers = [_matches(keyword, lookup) for keyword in avoids]
+    like_matchers = [(keyword,) + _matches(keyword, lookup) for keyword in likes]
+    rng = random.Random(str(seed))
+    by_role, matched = {}, set()
+    # 菜谱可能有上万道，只遍历一遍
+    for rid, name, category in candidates:
+        if any(rid in ids or pattern.search(name) for pattern, ids in avoid_matchers): continue
+        score = 0
+        for keyword, pattern, ids in like_matchers:
+            if rid in ids or pattern.search(name) or pattern.search(category or ''):
+                score += 1
+                matched.add(keyword)
+        by_role.setdefault(role_of(category), []).append((-score, rng.random(), rid, name))
+    # 不必整体排序
+    return {role: heapq.nsmallest(per_role, ranked) for role, ranked in by_role.items()}, matched
+
+
+def _shortlist(by_role, slots, limit):
+    """按菜位比例轮流从各种类里取，保证荤素汤都有；菜单里用不到的种类 (如人少时的主食) 每轮也取一道，
+    没有种类的菜 (自定义分类) 排在每轮最后"""
+    quota = OrderedDict((role, slots.count(role)) for role in slots)
+    for role in list(ROLE_KEYWORDS) + [None]:
+        quota.setdefault(role, 1)
+    queues = {role: list(reversed(by_role.get(role, ()))) for role in quota}
+    picked = []
+    while len(picked) < limit and any(queues.values()):
+        for role, n in quota.items():
+            for _ in range(min(n, len(queues[role]), limit - len(picked))):
+                _, _, rid, name = queues[role].pop()
+                picked.append(Dish(role or '其他', rid, name))
+    return picked
+
+
+def plan_menu(candidates, people_count, preferences, seed='', lookup=None, shortlist=0):
+    """挑菜：每个菜位在对应种类里取得分最高的，得分 = 命中想吃的关键字数；忌口的整道排除；同分按 seed 打乱。
+    shortlist > 0 时顺便按同样的打分选出最多这么多道候选 (MenuPlan.shortlist)，给 AI 润色时代替整个菜谱库"""
+    people = parse_people(people_count)
+    likes, avoids = parse_preferences(preferences)
+    slots = _slots(people, likes)
+    # 每类最多用到 len(slots) 道
+    by_role, matched = _rank_by_role(candidates, likes, avoids, seed, lookup, max(len(slots), shortlist))
+
+    dishes, used = [], set()
+    for slot in slots:
+        role, pick, tried = slot, None, set()
+        while role and role not in tried:
+            tried.add(role)
+            pick = next(((rid, name) for _, _, rid, name in by_role.get(role, ()) if rid not in used), None)
+            if pick: break
+            role = ROLE_FALLBACK.get(role)
+        if not pick: continue
+        used.add(pick[0])
+        dishes.append(Dish(role, *pick))
+    # 一道带种类的菜都没有 (分类全是自定义的)，就从其余菜谱里按得分挑
+    if not dishes:
+        dishes = [Dish('家常菜', rid, name) for _, _, rid, name in by_role.get(None, ())[:len(slots)]]
+    return MenuPlan(people, dishes, likes, avoids, [k for k in likes if k not in matched],
+                    _shortlist(by_role, slots, shortlist) if shortlist else [])
+
+
+
+def _format_amount(value):
+    return str(int(value)) if value == int(value) else f"{value:.1f}"
+
+
+def merge_quantities(items):
+    """[(名称, 用量)] -> [(名称, 合并后的用量)]，按首次出现的顺序；"300g" 这类同单位相加，"适量" 之类原样保留"""
+    merged = OrderedDict()
+    for name, quantity in items:
+        name = (name or '').strip()
+        if not name: continue
+        totals, texts = merged.setdefault(name, (OrderedDict(), []))
+        quantity = (quantity or '').strip()
+        m = QUANTITY_RE.match(quantity)
+        if m:
+            totals[m.group(2)] = totals.get(m.group(2), 0) + float(m.group(1))
+        elif quantity and quantity not in texts:
+            texts.append(quantity)
+    return [(name, ' + '.join([f"{_format_amount(v)}{unit}" for unit, v in totals.items()] + texts))
+            for name, (totals, texts) in merged.items()]
+
+
+COOKING_STEPS = [
+    ('主食', "{names}最先开始，交给电饭煲或蒸锅"),
+    ('汤', "{names}需要久煮，洗切好先下锅小火慢炖"),
+    ('荤菜', "趁炖汤的时候处理{names}：腌制、焯水后依次下锅"),
+    ('水产', "{names}下锅时间短，鱼虾最后再处理，保证鲜嫩"),
+    ('家常菜', "{names}按菜谱做法穿插进行"),
+    ('素菜', "{names}留到最后快炒，出锅就上桌"),
+]
+
+
+def render_plan(plan, ingredients, seasonings):
+    """ingredients / seasonings 为 [(recipe_id, 名称, 用量)]，只取菜单里的菜；返回 Markdown"""
+    lines = ["## 推荐菜单", ""]
+    if not plan.dishes:
+        return "## 推荐菜单\n\n本地菜谱里没有合适的菜，先去添加几道菜谱，或者试试 AI 推荐。\n"
+    lines += [f"- {d.role}：[{d.name}](/recipe/{d.id})" for d in plan.dishes]
+    notes = []
+    if plan.avoids: notes.append(f"已避开：{'、'.join(plan.avoids)}")
+    if plan.unmatched: notes.append(f"本地菜谱里没找到和「{'、'.join(plan.unmatched)}」相关的菜，可以让 AI 帮忙调整")
+    if notes: lines += ["", "> " + "；".join(notes)]
+
+    ids = {d.id for d in plan.dishes}
+    lines += ["", "## 材料清单", ""]
+    for title, rows in (("食材", ingredients), ("调料", seasonings)):
+        merged = merge_quantities((name, quantity) for rid, name, quantity in rows if rid in ids)
+        if not merged: continue
+        lines += [f"**{title}**", ""] + [f"- {name} {amount}".rstrip() for name, amount in merged] + [""]
+    if lines[-2] == "## 材料清单":
+        lines += ["这些菜谱还没有录入材料。", ""]
+
+    lines += ["## 做菜顺序", ""]
+    step = 0
+    for role, template in COOKING_STEPS:
+        names = [f"「{d.name}」" for d in plan.dishes if d.role == role]
+        if not names: continue
+        step += 1
+        lines.append(f"{step}. " + template.format(names='、'.join(names)))
+    return "\n".join(lines) + "\n"
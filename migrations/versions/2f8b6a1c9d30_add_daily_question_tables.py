@@ -0,0 +1,47 @@
+"""add daily_question and daily_answer tables
+
+Revision ID: 2f8b6a1c9d30
+Revises: fed0ce8a2975
+Create Date: 2026-10-17 20:11:47.902214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f8b6a1c9d30'
+down_revision = 'fed0ce8a2975'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 这两张表早期由 db.create_all() 建出，从未进过迁移；已有的库跳过，新库 (如 PostgreSQL) 在这里创建，
+    # 后面 question_like 的外键和 daily_answer 的索引都依赖它们
+    existing = sa.inspect(op.get_bind()).get_table_names()
+    if 'daily_question' not in existing:
+        op.create_table('daily_question',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.String(length=200), nullable=False),
+        sa.Column('date_str', sa.String(length=10), nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('date_str')
+        )
+    if 'daily_answer' not in existing:
+        op.create_table('daily_answer',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['question_id'], ['daily_question.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    # 不删表：已部署的库里这两张表是 create_all 建的、存着用户数据，upgrade() 并没有创建它们，
+    # 而这里无从区分是哪种情况。需要彻底回退的新库请手动 DROP TABLE daily_answer, daily_question
+    pass
@@ -0,0 +1,49 @@
+"""add fts5 search_index
+
+Revision ID: 4a6c8e0f2b15
+Revises: e7a2b6c4d913
+Create Date: 2026-10-17 15:18:44.037215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a6c8e0f2b15'
+down_revision = 'e7a2b6c4d913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 虚拟表只在 SQLite 上创建；内容由应用的 flush 钩子维护，这里回填已有数据
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+               "kind UNINDEXED, ref_id UNINDEXED, owner_id UNINDEXED, title, body, tokenize='trigram')")
+    op.execute("""
+        INSERT INTO search_index (kind, ref_id, owner_id, title, body)
+        SELECT 'recipe', r.id, r.user_id, r.name,
+               substr(COALESCE(r.category, '') || ' ' || COALESCE((SELECT group_concat(i.name, ' ') FROM ingredient i WHERE i.recipe_id = r.id), '')
+                      || ' ' || COALESCE(r.instructions, ''), 1, 4000)
+        FROM recipe r
+    """)
+    op.execute("""
+        INSERT INTO search_index (kind, ref_id, owner_id, title, body)
+        SELECT 'journal', j.id, j.author_id, j.date_str, substr(j.content, 1, 4000) FROM journal_entry j
+    """)
+    op.execute("""
+        INSERT INTO search_index (kind, ref_id, owner_id, title, body)
+        SELECT 'memory', m.id, m.author_id, m.title, substr(COALESCE(m.location, '') || ' ' || m.content, 1, 4000) FROM memory m
+    """)
+    op.execute("""
+        INSERT INTO search_index (kind, ref_id, owner_id, title, body)
+        SELECT 'wish', w.id, w.author_id, w.content, '' FROM wishlist_item w
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE IF EXISTS search_index")
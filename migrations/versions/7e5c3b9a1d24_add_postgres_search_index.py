@@ -0,0 +1,65 @@
+"""add search_index table with trigram indexes on PostgreSQL
+
+Revision ID: 7e5c3b9a1d24
+Revises: 3c7d9e2f4a61
+Create Date: 2026-10-17 20:26:03.115870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e5c3b9a1d24'
+down_revision = '3c7d9e2f4a61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite 用的是 4a6c8e0f2b15 建的 FTS5 虚拟表；PostgreSQL 上建普通表，title/body 加 pg_trgm GIN 索引支持 ILIKE 搜索中文
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    op.create_table('search_index',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('ref_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.Text(), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_search_index_kind_ref', 'search_index', ['kind', 'ref_id'], unique=False)
+    op.create_index('ix_search_index_owner', 'search_index', ['owner_id'], unique=False)
+    # pg_trgm 是 contrib 扩展，部分托管/精简安装里没有；没有时搜索仍可用，只是顺序扫描
+    if bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).scalar():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_search_index_title_trgm ON search_index USING gin (title gin_trgm_ops)")
+        op.execute("CREATE INDEX ix_search_index_body_trgm ON search_index USING gin (body gin_trgm_ops)")
+
+    op.execute("""
+        INSERT INTO search_index (kind, ref_id, owner_id, title, body)
+        SELECT 'recipe', r.id, r.user_id, r.name,
+               left(COALESCE(r.category, '') || ' ' || COALESCE((SELECT string_agg(i.name, ' ') FROM ingredient i WHERE i.recipe_id = r.id), '')
+                    || ' ' || COALESCE(r.instructions, ''), 4000)
+        FROM recipe r
+    """)
+    op.execute("""
+        INSERT INTO search_index (kind, ref_id, owner_id, title, body)
+        SELECT 'journal', j.id, j.author_id, j.date_str, left(j.content, 4000) FROM journal_entry j
+    """)
+    op.execute("""
+        INSERT INTO search_index (kind, ref_id, owner_id, title, body)
+        SELECT 'memory', m.id, m.author_id, m.title, left(COALESCE(m.location, '') || ' ' || m.content, 4000) FROM memory m
+    """)
+    op.execute("""
+        INSERT INTO search_index (kind, ref_id, owner_id, title, body)
+        SELECT 'wish', w.id, w.author_id, w.content, '' FROM wishlist_item w
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_table('search_index')
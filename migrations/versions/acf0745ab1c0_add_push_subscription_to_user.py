@@ -1,7 +1,7 @@
 """add push_subscription to user
 
 Revision ID: acf0745ab1c0
-Revises: fed0ce8a2975
+Revises: 2f8b6a1c9d30
 Create Date: 2026-04-28 19:33:38.723821
 
 """
@@ -11,7 +11,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = 'acf0745ab1c0'
-down_revision = 'fed0ce8a2975'
+down_revision = '2f8b6a1c9d30'
 branch_labels = None
 depends_on = None
 
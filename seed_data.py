@@ -0,0 +1,227 @@
+"""生成压测/基准测试用的合成数据：N 对情侣、上万道菜谱、几年的日记/回忆/每日一问。
+
+用法:
+    python seed_data.py --db sqlite:///bench.db --reset
+    python seed_data.py --db sqlite:///bench.db --reset --couples 50 --recipes 50000 --years 5
+
+默认写入项目目录下的 bench.db，不会碰 recipes.db。所有账号的密码都是 --password (默认 bench)，
+用户名为 user1, user2, ...，user1/user2 是一对，以此类推。相同 --seed 在同一天生成的数据相同。
+"""
+import os
+import time
+import random
+import argparse
+import datetime
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_DB = 'sqlite:///' + os.path.join(basedir, 'bench.db')
+BATCH_SIZE = 5000
+
+CATEGORIES = ['荤菜', '素菜', '水产', '汤与粥', '主食', '早餐', '甜品', '饮品', '半成品加工']
+MAIN_INGREDIENTS = [
+    '鸡蛋', '番茄', '土豆', '猪肉', '五花肉', '排骨', '牛肉', '牛腩', '羊肉', '鸡腿', '鸡翅', '鸡胸肉', '鸭肉',
+    '虾仁', '鲈鱼', '草鱼', '带鱼', '鱿鱼', '花蛤', '豆腐', '豆干', '腐竹', '茄子', '青椒', '尖椒', '西兰花',
+    '花菜', '白菜', '娃娃菜', '菠菜', '生菜', '油麦菜', '芹菜', '韭菜', '黄瓜', '冬瓜', '南瓜', '丝瓜', '苦瓜',
+    '莲藕', '山药', '胡萝卜', '白萝卜', '洋葱', '蘑菇', '香菇', '金针菇', '杏鲍菇', '木耳', '海带', '紫菜',
+    '豆芽', '四季豆', '荷兰豆', '玉米', '红薯', '米饭', '面条', '年糕', '馒头', '面粉', '糯米', '小米', '燕麦',
+    '牛奶', '酸奶', '芒果', '香蕉', '苹果', '柠檬', '红枣', '银耳', '绿豆', '红豆', '培根', '火腿', '午餐肉',
+]
+SEASONINGS = ['盐', '生抽', '老抽', '蚝油', '料酒', '白糖', '冰糖', '醋', '香醋', '豆瓣酱', '黄豆酱', '甜面酱',
+              '辣椒', '花椒', '八角', '桂皮', '香叶', '葱', '姜', '蒜', '香菜', '淀粉', '胡椒粉', '孜然', '芝麻油', '食用油']
+METHODS = ['红烧', '清蒸', '爆炒', '干煸', '凉拌', '糖醋', '香煎', '油焖', '炖', '焖', '烤', '卤', '酸辣', '蒜蓉', '椒盐', '家常']
+STYLES = ['', '', '', '妈妈的', '懒人版', '快手', '减脂', '下饭', '宿舍版', '经典']
+PLACES = ['家里', '公园', '海边', '老街', '电影院', '火锅店', '山顶', '图书馆', '夜市', '游乐园', '机场', '外婆家']
+WORDS = ['今天', '一起', '晚饭', '散步', '下雨', '阳光', '加班', '周末', '做饭', '电影', '聊天', '想你', '开心',
+         '累了', '吵架', '和好', '旅行', '计划', '猫', '咖啡', '地铁', '超市', '打扫', '礼物', '惊喜', '早睡']
+QUESTIONS = ['如果明天放假一天你想怎么过？', '最近一次被我感动是什么时候？', '你觉得我们最像哪部电影里的情侣？',
+             '小时候最怕什么？', '最想和我一起学的一项技能是什么？', '我们第一次旅行你印象最深的是哪一刻？',
+             '如果可以改掉我一个小习惯，你会选哪个？', '你理想中的周日早晨是什么样的？']
+
+
+def sentence(rng, words=12):
+    return ''.join(rng.choice(WORDS) for _ in range(words)) + '。'
+
+
+def instructions_markdown(rng):
+    ingredients = rng.sample(MAIN_INGREDIENTS, rng.randint(2, 6))
+    steps = '\n'.join(f"{i}. {rng.choice(METHODS)}{rng.choice(ingredients)}，{sentence(rng, 6)}" for i in range(1, rng.randint(4, 9)))
+    return "## 必备原料和工具\n\n" + '\n'.join(f"- {n}" for n in ingredients) + f"\n\n## 操作\n\n{steps}\n"
+
+
+def bulk_insert(model, rows, returning=False):
+    """分批插入，returning=True 时按输入顺序返回主键，否则返回行数"""
+    from sqlalchemy import insert
+    from app import db
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        chunk = rows[start:start + BATCH_SIZE]
+        if returning:
+            ids += db.session.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), chunk).all()
+        else:
+            db.session.execute(insert(model), chunk)
+        db.session.commit()
+    return ids if returning else len(rows)
+
+
+def reset_database():
+    """删掉所有表 (包括 search_index 和迁移版本表) 后重新执行全部迁移"""
+    from flask_migrate import upgrade
+    from sqlalchemy import text
+    from app import db
+    db.drop_all()
+    db.session.execute(text("DROP TABLE IF EXISTS search_index"))
+    db.session.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    db.session.commit()
+    upgrade(directory=os.path.join(basedir, 'migrations'))
+
+
+def seed(args):
+    from flask_migrate import upgrade
+    from sqlalchemy import update
+    from werkzeug.security import generate_password_hash
+    from app import (db, User, Recipe, Ingredient, Seasoning, CookingLog, JournalEntry, Memory, WishlistItem, FridgeItem,
+                     Activity, DailyQuestion, DailyAnswer, QuestionLike, QuestionBank, SYSTEM_USERNAME, QUESTION_TOPICS, QUESTION_STYLES,
+                     question_key, render_markdown, markdown_hash, rebuild_search_index, rebuild_question_preferences)
+
+    rng = random.Random(args.seed)
+    today = datetime.date.today()
+    start_date = today - datetime.timedelta(days=int(args.years * 365))
+    days = [start_date + datetime.timedelta(days=n) for n in range((today - start_date).days + 1)]
+    now = datetime.datetime.utcnow()
+    counts = {}
+
+    if args.reset:
+        reset_database()
+    else:
+        upgrade(directory=os.path.join(basedir, 'migrations'))
+        if db.session.query(User.id).first():
+            raise SystemExit("目标库里已经有用户了；确认要清空重建请加 --reset")
+
+    # 1. 用户：系统账号 + N 对情侣 (密码哈希只算一次)
+    password_hash = generate_password_hash(args.password)
+    user_rows = [{'username': SYSTEM_USERNAME, 'password_hash': password_hash}] + \
+                [{'username': f"user{n}", 'password_hash': password_hash} for n in range(1, args.couples * 2 + 1)]
+    user_ids = bulk_insert(User, user_rows, returning=True)
+    system_id, people = user_ids[0], user_ids[1:]
+    couples = [(people[i], people[i + 1]) for i in range(0, len(people), 2)]
+    db.session.execute(update(User), [{'id': a, 'partner_id': b} for a, b in couples] + [{'id': b, 'partner_id': a} for a, b in couples])
+    db.session.commit()
+    names = {uid: row['username'] for uid, row in zip(user_ids, user_rows)}
+    counts['user'] = len(user_ids)
+
+    # 2. 菜谱：约 60% 属于系统账号 (所有人可见)，其余平均分给各个用户
+    # 做法从几百份模板里挑，Markdown 只渲染这几百次 (逐条渲染两万道菜要一分钟)
+    instruction_pool = [instructions_markdown(rng) for _ in range(300)]
+    rendered = {text: (render_markdown(text), markdown_hash(text)) for text in instruction_pool}
+    recipe_rows, recipe_ingredients, recipe_seasonings, seen_names = [], [], [], set()
+    for n in range(args.recipes):
+        main = rng.sample(MAIN_INGREDIENTS, rng.randint(2, 7))
+        name = f"{rng.choice(STYLES)}{rng.choice(METHODS)}{main[0]}"
+        if name in seen_names: name = f"{name} {n}"  # 菜名唯一
+        seen_names.add(name)
+        instructions = rng.choice(instruction_pool)
+        recipe_rows.append({'name': name, 'instructions': instructions, 'category': rng.choice(CATEGORIES),
+                            'user_id': system_id if rng.random() < 0.6 or not people else rng.choice(people),
+                            'image_file': 'default.jpg', 'instructions_html': rendered[instructions][0],
+                            'instructions_hash': rendered[instructions][1]})
+        recipe_ingredients.append(main)
+        recipe_seasonings.append(rng.sample(SEASONINGS, rng.randint(2, 6)))
+    recipe_ids = bulk_insert(Recipe, recipe_rows, returning=True)
+    counts['recipe'] = len(recipe_ids)
+    counts['ingredient'] = (bulk_insert(Ingredient, [{'name': n, 'quantity': f"{rng.randint(1, 500)}g", 'recipe_id': rid}
+                                                        for rid, ings in zip(recipe_ids, recipe_ingredients) for n in ings]))
+    counts['seasoning'] = (bulk_insert(Seasoning, [{'name': n, 'quantity': '适量', 'recipe_id': rid}
+                                                      for rid, seas in zip(recipe_ids, recipe_seasonings) for n in seas]))
+    own_recipes = [(rid, row['user_id'], row['name']) for rid, row in zip(recipe_ids, recipe_rows) if row['user_id'] != system_id]
+    log_rows = [{'date_cooked': datetime.datetime.combine(rng.choice(days), datetime.time(rng.randint(11, 20))),
+                 'time_taken': f"{rng.randint(10, 90)} 分钟", 'notes': sentence(rng, 5), 'recipe_id': rid}
+                for rid, _, _ in own_recipes for _ in range(rng.randint(0, 3))]
+    counts['cooking_log'] = (bulk_insert(CookingLog, log_rows))
+
+    # 3. 情侣数据：日记、回忆、愿望、冰箱贴、首页动态
+    journal_rows, memory_rows, wish_rows, fridge_rows, activity_rows = [], [], [], [], []
+    for a, b in couples:
+        for uid in (a, b):
+            for day in days:
+                if rng.random() < args.journal_rate:
+                    journal_rows.append({'date_str': day.strftime('%Y-%m-%d'), 'content': sentence(rng, rng.randint(8, 60)), 'author_id': uid})
+            for _ in range(int(args.years * 30)):
+                title = f"{rng.choice(PLACES)}{rng.choice(WORDS)}"
+                memory_rows.append({'title': title, 'memory_date': rng.choice(days), 'location': rng.choice(PLACES),
+                                    'content': sentence(rng, rng.randint(20, 120)), 'image_file': 'default.jpg', 'author_id': uid})
+            for _ in range(40):
+                wish_rows.append({'content': f"一起去{rng.choice(PLACES)}{rng.choice(WORDS)}", 'is_completed': rng.random() < 0.4, 'author_id': uid})
+            for _ in range(3):
+                fridge_rows.append({'title': f"{rng.choice(WORDS)}纪念日", 'target_date': rng.choice(days) + datetime.timedelta(days=rng.randint(0, 400)),
+                                    'item_type': rng.choice(['anniversary', 'countdown']), 'author_id': uid})
+    for row in journal_rows:
+        activity_rows.append({'kind': 'journal', 'text': f"{names[row['author_id']]} 写了一篇日记 ({row['date_str']})",
+                              'author_id': row['author_id'], 'created_at': now})
+    for rid, uid, name in own_recipes:
+        activity_rows.append({'kind': 'recipe', 'text': f"{names[uid]} 添加了新菜谱: {name}", 'author_id': uid, 'created_at': now})
+    rng.shuffle(activity_rows)
+    counts['journal_entry'] = (bulk_insert(JournalEntry, journal_rows))
+    counts['memory'] = (bulk_insert(Memory, memory_rows))
+    counts['wishlist_item'] = (bulk_insert(WishlistItem, wish_rows))
+    counts['fridge_item'] = (bulk_insert(FridgeItem, fridge_rows))
+    counts['activity'] = (bulk_insert(Activity, activity_rows))
+
+    # 4. 每日一问：每天一题 (含今天)，各情侣按比例回答/点赞
+    question_rows = []
+    for day in days:
+        row = {'content': f"{rng.choice(QUESTIONS)[:-1]} ({day})", 'date_str': day.strftime('%Y-%m-%d'), 'source': rng.choice(['AI 生成', '随机题库'])}
+        if row['source'] == 'AI 生成': row.update(topic=rng.choice(QUESTION_TOPICS), style=rng.choice(QUESTION_STYLES))
+        question_rows.append(row)
+    question_ids = bulk_insert(DailyQuestion, question_rows, returning=True)
+    answer_rows, like_rows = [], []
+    for a, b in couples:
+        for qid in question_ids:
+            for uid in (a, b):
+                if rng.random() < args.answer_rate:
+                    answer_rows.append({'content': sentence(rng, rng.randint(5, 40)), 'user_id': uid, 'question_id': qid})
+                if rng.random() < 0.15:
+                    like_rows.append({'question_id': qid, 'user_id': uid})
+    counts['daily_question'] = len(question_ids)
+    counts['daily_answer'] = (bulk_insert(DailyAnswer, answer_rows))
+    counts['question_like'] = (bulk_insert(QuestionLike, like_rows))
+    counts['question_preference'] = rebuild_question_preferences()
+    # 题库余量：一个月的未使用题目
+    bank_rows = []
+    for n in range(30):
+        content = f"{rng.choice(QUESTIONS)[:-1]}？(题库 {n + 1})"
+        bank_rows.append({'content': content, 'content_key': question_key(content), 'topic': rng.choice(QUESTION_TOPICS),
+                          'style': rng.choice(QUESTION_STYLES), 'created_at': now})
+    counts['question_bank'] = (bulk_insert(QuestionBank, bank_rows))
+
+    # 批量写入绕过了 ORM 钩子，最后统一重建搜索索引
+    counts['search_index'] = rebuild_search_index()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成合成测试数据')
+    parser.add_argument('--db', default=DEFAULT_DB, help='目标数据库 (默认项目目录下的 bench.db)')
+    parser.add_argument('--reset', action='store_true', help='清空目标库所有表后重建 (会丢掉目标库现有数据)')
+    parser.add_argument('--couples', type=int, default=10, help='情侣对数')
+    parser.add_argument('--recipes', type=int, default=20000, help='菜谱总数')
+    parser.add_argument('--years', type=float, default=3, help='日记/每日一问覆盖的年数')
+    parser.add_argument('--journal-rate', type=float, default=0.5, help='每人每天写日记的概率')
+    parser.add_argument('--answer-rate', type=float, default=0.7, help='每人每天回答每日一问的概率')
+    parser.add_argument('--password', default='bench', help='所有账号的密码')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    args = parser.parse_args()
+
+    # app 在导入时读取 DATABASE_URL
+    os.environ['DATABASE_URL'] = args.db
+    from app import app
+
+    started = time.perf_counter()
+    with app.app_context():
+        counts = seed(args)
+    for table, count in counts.items():
+        print(f"  {table:<16} {count:>8}")
+    print(f"生成完成，耗时 {time.perf_counter() - started:.2f}s。登录账号 user1 / {args.password}")
+
+
+if __name__ == '__main__':
+    main()
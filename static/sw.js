@@ -1,35 +0,0 @@
-const CACHE_NAME = 'lovers-space-v1';
-const URLS_TO_CACHE = [
-  '/',
-  '/static/manifest.json',
-];
-
-self.addEventListener('install', (event) => {
-  event.waitUntil(
-    caches.open(CACHE_NAME).then((cache) => cache.addAll(URLS_TO_CACHE))
-  );
-});
-
-self.addEventListener('fetch', (event) => {
-  event.respondWith(
-    caches.match(event.request).then((response) => response || fetch(event.request))
-  );
-});
-
-self.addEventListener('activate', (event) => {
-  event.waitUntil(
-    caches.keys().then((names) =>
-      Promise.all(names.filter(n => n !== CACHE_NAME).map(n => caches.delete(n)))
-    )
-  );
-});
-
-self.addEventListener('push', (event) => {
-  let data = { title: '情侣小窝', body: '你有新消息！' };
-  if (event.data) {
-    try { data = event.data.json(); } catch(e) { data.body = event.data.text(); }
-  }
-  event.waitUntil(
-    self.registration.showNotification(data.title, { body: data.body, icon: '/static/icon.png' })
-  );
-});
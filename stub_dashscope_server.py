@@ -0,0 +1,148 @@
+"""本地 DashScope 文本生成桩服务，用来在没有网络/API 额度的情况下测试 AI 菜单 (含流式输出)。
+
+用法:
+    python stub_dashscope_server.py --port 8766 --first-delay 0.3 --chunk-delay 0.05
+    export DASHSCOPE_GENERATION_URL=http://127.0.0.1:8766/api/v1/services/aigc/text-generation/generation
+
+带 X-DashScope-SSE: enable 请求头时按 DashScope 的 SSE 格式逐段返回，否则一次性返回 JSON。
+--fail-rate / --fail-status 模拟限流 (429，带 Retry-After) 和服务端错误，用来验证 dashscope_client 的重试和熔断。
+回复内容从 prompt 里的 "菜名(链接ID:N)" 候选中挑几道菜拼成菜单；批量出题的 prompt 按编号逐行返回 "编号|问题"。
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANDIDATE_RE = re.compile(r'([^\s、；：【】]+?)\(链接ID:(\d+)\)')
+QUESTION_CELL_RE = re.compile(r'^\s*(\d+)\. 主题：(.+?)；风格：(.+)$', re.M)
+QUESTION_TEMPLATES = ["用{style}口吻聊聊：关于{topic}，你印象最深的一个瞬间是什么？",
+                      "{style}一问：如果把{topic}拍成电影，第一幕会是什么场景？",
+                      "{style}地说说，{topic}这件事上，你最想让我知道的是什么？"]
+
+
+def compose_questions(cells):
+    """每个编号随机套一个模板；模板很少，重复出题时能测到去重"""
+    return "\n".join(f"{n}|{random.choice(QUESTION_TEMPLATES).format(topic=topic, style=style.rstrip('的'))}" for n, topic, style in cells) + "\n"
+
+
+def compose_reply(prompt):
+    """按 prompt 中的候选菜谱拼一份菜单；其中一道故意照抄 "菜名(链接ID:N)" 格式，用来测试链接改写"""
+    cells = QUESTION_CELL_RE.findall(prompt)
+    if cells: return compose_questions(cells)
+    candidates = CANDIDATE_RE.findall(prompt)
+    picked = random.sample(candidates, min(3, len(candidates)))
+    lines = ["## 推荐菜单", ""]
+    for i, (name, rid) in enumerate(picked):
+        lines.append(f"- {name}(链接ID:{rid})" if i == len(picked) - 1 else f"- [{name}](/recipe/{rid})")
+    lines.append("- 紫菜蛋花汤")
+    lines += ["", "## 材料清单", "", "- 鸡蛋 3 个", "- 葱姜蒜 适量", "- 紫菜 1 小把",
+              "", "## 做菜顺序", "", "1. 先炖需要久煮的菜", "2. 再炒快手菜", "3. 最后煮汤"]
+    return "\n".join(lines) + "\n"
+
+
+def usage(prompt, output):
+    """按字符数粗略充当 token 数，够用来比较提示词长短"""
+    return {"input_tokens": len(prompt), "output_tokens": len(output), "total_tokens": len(prompt) + len(output)}
+
+
+def chunk_text(text, size=6):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class StubDashScopeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    first_delay = 0.0
+    chunk_delay = 0.0
+    fail_rate = 0.0
+    fail_status = 500
+    requests_served = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        cls = type(self)
+        with cls.lock:
+            cls.requests_served += 1
+        if random.random() < cls.fail_rate:
+            if cls.fail_status == 429:
+                return self.send_json(429, {"code": "Throttling.RateQuota", "message": "stub rate limit"}, {'Retry-After': '0.2'})
+            return self.send_json(cls.fail_status, {"code": "InternalError", "message": "stub failure"})
+        prompt = body.get('input', {}).get('messages', [{}])[-1].get('content', '')
+        reply = compose_reply(prompt)
+        request_id = str(uuid.uuid4())
+        if cls.first_delay:
+            time.sleep(cls.first_delay)
+        if self.headers.get('X-DashScope-SSE') != 'enable':
+            return self.send_json(200, {
+                "output": {"choices": [{"message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}]},
+                "usage": usage(prompt, reply),
+                "request_id": request_id,
+            })
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        incremental = body.get('parameters', {}).get('incremental_output', False)
+        chunks = chunk_text(reply)
+        for i, piece in enumerate(chunks, 1):
+            if cls.chunk_delay:
+                time.sleep(cls.chunk_delay)
+            content = piece if incremental else ''.join(chunks[:i])
+            data = {"output": {"choices": [{"message": {"role": "assistant", "content": content},
+                                            "finish_reason": "stop" if i == len(chunks) else "null"}]},
+                    "usage": usage(prompt, ''.join(chunks[:i])),
+                    "request_id": request_id}
+            self.wfile.write(f"id:{i}\nevent:result\n:HTTP_STATUS/200\ndata:{json.dumps(data, ensure_ascii=False)}\n\n".encode())
+            self.wfile.flush()
+        self.close_connection = True
+
+    def do_GET(self):
+        self.send_json(200, {"requests": type(self).requests_served})
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=8766, first_delay=0.0, chunk_delay=0.0, fail_rate=0.0, fail_status=500):
+    StubDashScopeHandler.first_delay = first_delay
+    StubDashScopeHandler.chunk_delay = chunk_delay
+    StubDashScopeHandler.fail_rate = fail_rate
+    StubDashScopeHandler.fail_status = fail_status
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubDashScopeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='本地 DashScope 桩服务')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--first-delay', type=float, default=0.3, help='返回第一段内容前的延迟 (秒)')
+    parser.add_argument('--chunk-delay', type=float, default=0.05, help='流式输出每段之间的延迟 (秒)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='随机返回错误的比例 (0~1)')
+    parser.add_argument('--fail-status', type=int, default=500, help='失败时返回的状态码 (429 模拟限流)')
+    args = parser.parse_args()
+
+    server = serve(args.port, args.first_delay, args.chunk_delay, args.fail_rate, args.fail_status)
+    print(f"桩服务运行在 http://127.0.0.1:{args.port}")
+    print(f"export DASHSCOPE_GENERATION_URL=http://127.0.0.1:{args.port}/api/v1/services/aigc/text-generation/generation")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
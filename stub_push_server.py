@@ -0,0 +1,96 @@
+"""本地 Web Push 桩服务，用来在没有真实推送服务的情况下测试 PushWorker。
+
+用法:
+    python stub_push_server.py --port 8765 --fail-rate 0.3 --delay 0.5
+
+启动后会打印一份指向本服务的订阅 JSON，把它写进某个用户的 push_subscription
+(或 POST 到 /push/subscribe)，再设置 VAPID_PRIVATE_KEY (npx web-push generate-vapid-keys
+生成的私钥) 即可触发投递。
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+
+def b64url(data):
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def make_subscription(endpoint):
+    """生成一份可被 pywebpush 加密的订阅 (客户端密钥对由本地随机生成)"""
+    key = ec.generate_private_key(ec.SECP256R1())
+    public = key.public_key().public_bytes(serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint)
+    return {"endpoint": endpoint, "keys": {"p256dh": b64url(public), "auth": b64url(os.urandom(16))}}
+
+
+class StubPushHandler(BaseHTTPRequestHandler):
+    fail_rate = 0.0
+    fail_status = 503
+    delay = 0.0
+    received = 0
+    failed = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        if self.delay:
+            time.sleep(self.delay)
+        cls = type(self)
+        with cls.lock:
+            if random.random() < cls.fail_rate:
+                cls.failed += 1
+                status = cls.fail_status
+            else:
+                cls.received += 1
+                status = 201
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        body = json.dumps({"received": type(self).received, "failed": type(self).failed}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=8765, fail_rate=0.0, fail_status=503, delay=0.0):
+    StubPushHandler.fail_rate = fail_rate
+    StubPushHandler.fail_status = fail_status
+    StubPushHandler.delay = delay
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubPushHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='本地 Web Push 桩服务')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='随机失败的比例 (0~1)')
+    parser.add_argument('--fail-status', type=int, default=503, help='失败时返回的状态码 (410 模拟订阅失效)')
+    parser.add_argument('--delay', type=float, default=0.0, help='每个请求的人为延迟 (秒)')
+    args = parser.parse_args()
+
+    server = serve(args.port, args.fail_rate, args.fail_status, args.delay)
+    print("订阅 JSON:")
+    print(json.dumps(make_subscription(f"http://127.0.0.1:{args.port}/push"), indent=2))
+    print(f"桩服务运行在 http://127.0.0.1:{args.port} ，GET / 查看收到的推送数量。Ctrl+C 退出。")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,106 @@
+// 由 /sw.js 路由渲染，缓存名带构建版本：每次部署后旧缓存在 activate 时清理
+const BUILD_VERSION = '{{ build_version }}';
+const PAGE_CACHE = `pages-${BUILD_VERSION}`;
+const ASSET_CACHE = `assets-${BUILD_VERSION}`;
+const PRECACHE_URLS = {{ precache | tojson }};
+const PAGE_CACHE_LIMIT = 50;
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(
+    caches.open(ASSET_CACHE).then((cache) => cache.addAll(PRECACHE_URLS)).then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    caches.keys().then((names) =>
+      Promise.all(names.filter(n => n !== PAGE_CACHE && n !== ASSET_CACHE).map(n => caches.delete(n)))
+    ).then(() => self.clients.claim())
+  );
+});
+
+// 带指纹的静态文件、按内容哈希命名的图片：内容永远不变，缓存优先
+async function cacheFirst(request) {
+  const cache = await caches.open(ASSET_CACHE);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (response.ok || response.type === 'opaque') cache.put(request, response.clone());
+  return response;
+}
+
+async function trimCache(cache, limit) {
+  const keys = await cache.keys();
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - limit)).map(k => cache.delete(k)));
+}
+
+// 页面：先给缓存里的旧版本，同时后台请求新版本 (服务器有 ETag，没变化时只是一个 304)
+async function staleWhileRevalidate(event, cacheName) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(event.request);
+  const isPage = cacheName === PAGE_CACHE;
+  const network = fetch(event.request).then(async (response) => {
+    const cacheable = isPage ? (response.status === 200 && response.type === 'basic') : (response.ok || response.type === 'opaque');
+    if (cacheable) {
+      await cache.put(event.request, response.clone());
+      if (isPage) await trimCache(cache, PAGE_CACHE_LIMIT);
+    } else if (response.type === 'opaqueredirect' || response.status >= 400) {
+      // 登录过期被重定向、页面已删除等：不能再把旧页面给出去
+      await cache.delete(event.request);
+    }
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+  }
+  return network.catch(async () => (await cache.match('/')) || new Response('网络不可用', { status: 503, headers: { 'Content-Type': 'text/plain; charset=utf-8' } }));
+}
+
+self.addEventListener('fetch', (event) => {
+  const request = event.request;
+  const url = new URL(request.url);
+  const sameOrigin = url.origin === self.location.origin;
+
+  // POST 等写操作只走网络；写完后页面缓存全部作废，避免重定向回来看到旧列表
+  if (request.method !== 'GET') {
+    if (sameOrigin) {
+      event.respondWith(fetch(request).then(async (response) => {
+        await caches.delete(PAGE_CACHE);
+        return response;
+      }));
+    }
+    return;
+  }
+
+  if (sameOrigin) {
+    if (url.pathname === '/logout' || url.pathname === '/login') {
+      event.respondWith(caches.delete(PAGE_CACHE).then(() => fetch(request)));
+      return;
+    }
+    if (url.pathname.startsWith('/static/') && (url.searchParams.has('v') || url.pathname.startsWith('/static/uploads/img/'))) {
+      event.respondWith(cacheFirst(request));
+      return;
+    }
+    if (request.mode === 'navigate') {
+      event.respondWith(staleWhileRevalidate(event, PAGE_CACHE));
+    }
+    // 其余请求 (JSON 接口、SSE) 交给浏览器，HTTP 缓存自己处理 ETag
+    return;
+  }
+
+  // CDN 上的样式/脚本/字体
+  if (['style', 'script', 'font'].includes(request.destination)) {
+    event.respondWith(staleWhileRevalidate(event, ASSET_CACHE));
+  }
+});
+
+self.addEventListener('push', (event) => {
+  let data = { title: '情侣小窝', body: '你有新消息！' };
+  if (event.data) {
+    try { data = event.data.json(); } catch(e) { data.body = event.data.text(); }
+  }
+  event.waitUntil(
+    self.registration.showNotification(data.title, { body: data.body, icon: '/static/icon.png' })
+  );
+});
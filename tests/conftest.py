@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+import pytest
+
+# 必须在导入 app 之前设置：测试用临时 SQLite 文件 (文件库才会启用读写分离，和线上一致)
+_tmpdir = tempfile.mkdtemp(prefix='myrecipeapp-test-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmpdir, 'test.db')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+
+@pytest.fixture
+def app_ctx():
+    from app import app, db
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def couple(app_ctx):
+    """绑定好的一对情侣 (a, b)"""
+    from app import db, User
+    a, b = User(username='a'), User(username='b')
+    a.set_password('x'); b.set_password('x')
+    db.session.add_all([a, b]); db.session.commit()
+    a.partner_id, b.partner_id = b.id, a.id
+    db.session.commit()
+    return a, b
+
+
+@pytest.fixture
+def client(app_ctx, couple):
+    """以 a 的身份登录的 test client"""
+    client = app_ctx.test_client()
+    assert client.post('/login', data={'username': 'a', 'password': 'x'}).status_code == 302
+    return client
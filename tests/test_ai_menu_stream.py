@@ -0,0 +1,44 @@
+import threading
+import time
+
+import app as app_module
+from app import db, Recipe, AIResultCache
+
+
+def login(app_ctx):
+    client = app_ctx.test_client()
+    client.post('/login', data={'username': 'a', 'password': 'x'})
+    return client
+
+
+def test_concurrent_streams_share_one_generation(app_ctx, couple, monkeypatch):
+    a, _ = couple
+    db.session.add_all([Recipe(name='番茄炒蛋', instructions='x', category='荤菜', user_id=a.id),
+                        Recipe(name='炒青菜', instructions='x', category='素菜', user_id=a.id)])
+    db.session.commit()
+    cache = AIResultCache()
+    monkeypatch.setattr(app_module, 'ai_menu_cache', cache)
+    calls, entered, release = [], threading.Event(), threading.Event()
+
+    def fake_stream(*args, **kwargs):
+        calls.append(1)
+        entered.set()
+        release.wait(5)
+        yield '今晚吃番茄炒蛋'
+    monkeypatch.setattr(app_module, 'stream_ai_menu', fake_stream)
+
+    bodies = {}
+    def fetch(name):
+        bodies[name] = login(app_ctx).get('/ai_menu/stream?people_count=2').get_data(as_text=True)
+    leader = threading.Thread(target=fetch, args=('leader',)); leader.start()
+    assert entered.wait(5)
+    follower = threading.Thread(target=fetch, args=('follower',)); follower.start()
+    deadline = time.time() + 5
+    while cache.stats()['coalesced'] == 0 and time.time() < deadline: time.sleep(0.01)
+    release.set()
+    leader.join(5); follower.join(5)
+
+    assert len(calls) == 1
+    assert cache.stats()['coalesced'] == 1
+    for body in bodies.values():
+        assert 'event: done' in body and '今晚吃番茄炒蛋' in body
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from app import AIResultCache
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    cache = AIResultCache(maxsize=4, ttl=60)
+    assert cache.get_or_compute('k', lambda: 'v1') == ('v1', 'miss')
+    now[0] += 59
+    assert cache.get_or_compute('k', lambda: 'v2') == ('v1', 'hit')
+    now[0] += 2
+    assert cache.get_or_compute('k', lambda: 'v3') == ('v3', 'miss')
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AIResultCache(maxsize=2, ttl=60)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    cache.get_or_compute('a', lambda: None)  # a 变为最近使用
+    cache.get_or_compute('c', lambda: 3)
+    assert cache.get_or_compute('a', lambda: 'new')[1] == 'hit'
+    assert cache.get_or_compute('b', lambda: 'new') == ('new', 'miss')
+    assert cache.stats()['size'] == 2
+
+
+def test_refresh_bypasses_cached_entry():
+    cache = AIResultCache(maxsize=2, ttl=60)
+    cache.get_or_compute('k', lambda: 'old')
+    assert cache.get_or_compute('k', lambda: 'new', refresh=True) == ('new', 'miss')
+    assert cache.get_or_compute('k', lambda: 'other') == ('new', 'hit')
+
+
+def test_followers_receive_the_leaders_exception():
+    cache = AIResultCache(maxsize=2, ttl=60)
+    entered, release = threading.Event(), threading.Event()
+    calls, errors = [], []
+
+    def failing():
+        calls.append(1)
+        entered.set()
+        release.wait(5)
+        raise RuntimeError('boom')
+
+    def run():
+        try: cache.get_or_compute('k', failing)
+        except RuntimeError as e: errors.append(e)
+
+    leader = threading.Thread(target=run); leader.start()
+    assert entered.wait(5)
+    followers = [threading.Thread(target=run) for _ in range(3)]
+    for t in followers: t.start()
+    deadline = time.time() + 5
+    while cache.stats()['coalesced'] < 3 and time.time() < deadline: time.sleep(0.01)
+    release.set()
+    for t in [leader] + followers: t.join(5)
+
+    assert len(calls) == 1
+    assert len(errors) == 4 and all(e is errors[0] for e in errors)
+    # 失败的结果不进缓存，也不会留下在途记录，下一次重新计算
+    assert cache.get_or_compute('k', lambda: 'ok') == ('ok', 'miss')
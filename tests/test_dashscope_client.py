@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from dashscope_client import AIClientError, CircuitBreaker, DashScopeClient
+
+
+class FakeStreamResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, chunks):
+        self.lines = [b'data:' + json.dumps(c, ensure_ascii=False).encode() for c in chunks]
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def half_open_client(chunks):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == 'half_open'
+    client = DashScopeClient('http://stub.invalid/x', 'test-model', breaker=breaker)
+    client.session.post = lambda *args, **kwargs: FakeStreamResponse(chunks)
+    return client, breaker
+
+
+@pytest.mark.parametrize('chunk', [
+    {'code': 'Throttling', 'message': 'rate limited'},  # 流里返回的错误段
+    {'output': {'choices': []}},                        # 结构不对
+    {'output': None},
+])
+def test_stream_bad_chunk_on_half_open_probe_releases_probe(chunk):
+    client, breaker = half_open_client([chunk])
+    with pytest.raises(AIClientError):
+        list(client.stream('sk-test', 'prompt'))
+    # 试探失败后重新打开；reset_timeout=0 所以立刻又能放行下一个试探，而不是一直拒绝
+    assert breaker.stats()['consecutive_failures'] == 2
+    assert breaker.allow()
+
+
+def test_stream_success_closes_breaker_and_reports_usage():
+    chunks = [{'output': {'choices': [{'message': {'content': '你好'}, 'finish_reason': 'null'}]}},
+              {'output': {'choices': [{'message': {'content': '呀'}, 'finish_reason': 'stop'}]},
+               'usage': {'input_tokens': 5, 'output_tokens': 2}}]
+    client, breaker = half_open_client(chunks)
+    usage = []
+    assert ''.join(client.stream('sk-test', 'prompt', on_usage=usage.append)) == '你好呀'
+    assert breaker.state == 'closed'
+    assert usage == [{'input_tokens': 5, 'output_tokens': 2}]
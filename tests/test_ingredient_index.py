@@ -0,0 +1,77 @@
+from sqlalchemy.orm import Session
+
+from app import db, Recipe, Ingredient, IngredientIndex, recipe_row_stats
+
+
+def add(user, name, ingredients):
+    recipe = Recipe(name=name, instructions='x', user_id=user.id)
+    db.session.add(recipe); db.session.flush()
+    for n in ingredients: db.session.add(Ingredient(name=n, quantity='1', recipe_id=recipe.id))
+    db.session.commit()
+    return recipe.id
+
+
+def rebuilt():
+    index = IngredientIndex()
+    index.ensure_fresh()
+    return index
+
+
+def assert_same(index):
+    fresh = rebuilt()
+    assert index.postings == fresh.postings
+    assert index.recipes == fresh.recipes
+
+
+def test_incremental_add_remove_edit_match_full_rebuild(couple):
+    a, _ = couple
+    add(a, '番茄炒蛋', ['番茄', '鸡蛋'])
+    add(a, '蛋花汤', ['鸡蛋', '紫菜'])
+    index = rebuilt()
+
+    rid = add(a, '番茄牛腩', ['番茄', '牛腩', ''])
+    index.add_recipe(rid, '番茄牛腩', a.id, ['番茄', '牛腩', ''], recipe_row_stats(rid))
+    assert_same(index)
+    # 推算出的签名和实际一致，下次查询不会整体重建
+    assert index._signature == tuple(index._current_signature())
+
+    stats = recipe_row_stats(rid)
+    db.session.delete(db.session.get(Recipe, rid)); db.session.commit()
+    index.remove_recipe(rid, stats)
+    assert_same(index)
+
+    # 编辑：同一道菜换了食材
+    egg = db.session.query(Recipe).filter_by(name='番茄炒蛋').one()
+    Ingredient.query.filter_by(recipe_id=egg.id).delete(); db.session.add(Ingredient(name='青椒', quantity='1', recipe_id=egg.id))
+    db.session.commit()
+    index.add_recipe(egg.id, egg.name, a.id, ['青椒'], recipe_row_stats(egg.id))
+    perfect, _ = index.match({'青椒'}, [a.id])
+    assert [r.name for r in perfect] == ['番茄炒蛋']
+    assert_same(index)
+
+
+def test_write_from_another_process_still_triggers_rebuild(couple):
+    a, _ = couple
+    add(a, '番茄炒蛋', ['番茄', '鸡蛋'])
+    index = rebuilt()
+    rid = add(a, '炒青菜', ['青菜'])
+    # 本进程提交之后、更新索引之前，另一个进程 (导入脚本) 也写入了一道菜
+    with Session(db.engine) as other:
+        recipe = Recipe(name='外来菜', instructions='x', user_id=a.id)
+        other.add(recipe); other.flush()
+        other.add(Ingredient(name='豆腐', quantity='1', recipe_id=recipe.id))
+        other.commit()
+    index.add_recipe(rid, '炒青菜', a.id, ['青菜'], recipe_row_stats(rid))
+
+    db.session.commit()  # 下一个请求：新的读事务
+    perfect, _ = index.match({'豆腐'}, [a.id])
+    assert [r.name for r in perfect] == ['外来菜']
+
+
+def test_match_ranks_perfect_and_partial(couple):
+    a, b = couple
+    add(a, '番茄炒蛋', ['番茄', '鸡蛋'])
+    add(b, '番茄牛腩', ['番茄', '牛腩', '土豆'])
+    perfect, partial = rebuilt().match({'番茄', '鸡蛋', '土豆'}, [a.id, b.id])
+    assert [r.name for r in perfect] == ['番茄炒蛋']
+    assert [(r.name, missing) for r, missing in partial] == [('番茄牛腩', ['牛腩'])]
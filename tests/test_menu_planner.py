@@ -0,0 +1,35 @@
+from menu_planner import Candidate, plan_menu
+
+RECIPES = {
+    1: ('青椒土豆丝', '素菜', ['青椒', '土豆', '胡椒粉']),
+    2: ('宫保鸡丁', '荤菜', ['鸡胸肉', '干辣椒', '花椒', '花生']),
+    3: ('剁椒鱼头', '水产', ['鱼头', '剁椒']),
+    4: ('红烧肉', '荤菜', ['五花肉', '冰糖']),
+    5: ('番茄蛋汤', '汤', ['番茄', '鸡蛋', '白胡椒']),
+}
+
+
+def lookup(words):
+    return {rid for rid, (_, _, ings) in RECIPES.items() if any(w in ing for ing in ings for w in words)}
+
+
+def plan(preferences, people='2人'):
+    candidates = [Candidate(rid, name, category) for rid, (name, category, _) in RECIPES.items()]
+    return plan_menu(candidates, people, preferences, seed='test', lookup=lookup)
+
+
+def test_no_spicy_keeps_green_pepper_dishes():
+    names = [d.name for d in plan('不要辣').dishes]
+    assert '青椒土豆丝' in names
+    assert '番茄蛋汤' in names
+    assert '宫保鸡丁' not in names and '剁椒鱼头' not in names
+
+
+def test_likes_spicy_prefers_hot_ingredients():
+    dishes = plan('喜欢吃辣').dishes
+    assert dishes[0].name == '宫保鸡丁'
+    assert '青椒土豆丝' in [d.name for d in dishes]  # 唯一的素菜，只是不加分
+
+
+def test_same_seed_same_menu():
+    assert plan('想吃肉', '3-4人') == plan('想吃肉', '3-4人')
@@ -0,0 +1,19 @@
+import app as app_module
+
+
+def test_worker_starts_on_first_request_when_vapid_configured(client, monkeypatch):
+    started = []
+    monkeypatch.setattr(app_module, 'VAPID_PRIVATE_KEY', 'key')
+    monkeypatch.setattr(app_module, '_push_worker_thread', None)
+    monkeypatch.setattr(app_module.push_worker, 'run_forever', lambda: started.append(True))
+    client.get('/')
+    app_module._push_worker_thread.join(1)
+    # 不需要先有 send_push：重启前留在发件箱里的消息也会被投递
+    assert started == [True]
+
+
+def test_worker_not_started_without_vapid(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'VAPID_PRIVATE_KEY', '')
+    monkeypatch.setattr(app_module, '_push_worker_thread', None)
+    client.get('/')
+    assert app_module._push_worker_thread is None
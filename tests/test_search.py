@@ -0,0 +1,17 @@
+from app import db, Recipe, Ingredient
+
+
+def test_search_etag_is_stable_and_timing_goes_in_header(client, couple):
+    a, _ = couple
+    recipe = Recipe(name='番茄炒蛋', instructions='先炒蛋', user_id=a.id)
+    db.session.add(recipe); db.session.flush()
+    db.session.add(Ingredient(name='番茄', quantity='2', recipe_id=recipe.id)); db.session.commit()
+
+    first = client.get('/search?q=番茄')
+    assert first.status_code == 200 and '/recipe/%d' % recipe.id in first.get_data(as_text=True)
+    assert first.headers['Server-Timing'].startswith('search;dur=')
+    again = client.get('/search?q=番茄', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+    data = client.get('/search?q=番茄&format=json').get_json()
+    assert 'took_ms' not in data and data['results'][0]['title_text'] == '番茄炒蛋'